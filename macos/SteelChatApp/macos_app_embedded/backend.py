@@ -2,18 +2,41 @@
 
 from __future__ import annotations
 
+import ctypes
+import functools
+import importlib
 import logging
+import logging.handlers
 import os
+import queue
 import shutil
 import socket
 import sys
 import threading
-from contextlib import closing
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 import uvicorn
 
+try:
+    import uvloop  # noqa: F401
+except ImportError:  # pragma: no cover - uvloop is unavailable on some dev hosts
+    UVICORN_LOOP = "asyncio"
+else:
+    UVICORN_LOOP = "uvloop"
+
+try:
+    import httptools  # noqa: F401
+except ImportError:  # pragma: no cover - falls back to the pure-Python parser
+    UVICORN_HTTP = "h11"
+else:
+    UVICORN_HTTP = "httptools"
+
+_THIS_FILE = Path(__file__).resolve()
+_PROJECT_ROOT = _THIS_FILE.parents[2]
+_RESOURCES_DIR = _THIS_FILE.parent.parent / "resources"
+
 LOG_DIR = Path.home() / "Library" / "Logs" / "SteelChatApp"
 APP_SUPPORT_DEFAULT = Path.home() / "Library" / "Application Support" / "SteelChatApp"
 
@@ -23,81 +46,222 @@ def _ensure_directory(path: Path) -> Path:
     return path
 
 
-def _find_free_port() -> int:
-    with closing(socket.socket(socket.AF_INET, socket.SOCK_STREAM)) as sock:
-        sock.bind(("127.0.0.1", 0))
+@functools.lru_cache(maxsize=None)
+def _libsystem() -> Optional[ctypes.CDLL]:
+    if sys.platform != "darwin":
+        return None
+    try:
+        return ctypes.CDLL("libSystem.dylib", use_errno=True)
+    except OSError:
+        return None
+
+
+# <sys/qos.h>; 0x21 would be QOS_CLASS_USER_INTERACTIVE.
+QOS_CLASS_USER_INITIATED = 0x19
+
+
+def _set_thread_qos(qos_class: int) -> None:
+    """Set the calling thread's macOS QoS class; a no-op elsewhere."""
+    lib = _libsystem()
+    set_qos = getattr(lib, "pthread_set_qos_class_self_np", None) if lib is not None else None
+    if set_qos is not None:
+        set_qos(ctypes.c_uint(qos_class), ctypes.c_int(0))
+
+
+@functools.lru_cache(maxsize=None)
+def _clonefile_func():
+    lib = _libsystem()
+    func = getattr(lib, "clonefile", None) if lib is not None else None
+    if func is not None:
+        func.argtypes = [ctypes.c_char_p, ctypes.c_char_p, ctypes.c_uint32]
+        func.restype = ctypes.c_int
+    return func
+
+
+def _clone_or_copy(src: Path, dest: Path) -> None:
+    """Seed ``dest`` from ``src``, preferring an APFS copy-on-write clone.
+
+    ``clonefile(2)`` clones files and whole directory trees as a metadata-only
+    operation; other filesystems and platforms fall back to ``shutil``. Seeds
+    are never hardlinked: the server writes into these paths, and a shared inode
+    would modify the original inside the signed bundle.
+    """
+    clonefile = _clonefile_func()
+    if clonefile is not None and clonefile(os.fsencode(src), os.fsencode(dest), 0) == 0:
+        return
+    if src.is_dir():
+        shutil.copytree(src, dest, dirs_exist_ok=True)
+    else:
+        shutil.copy2(src, dest)
+
+
+def _copy_if_stale(src: Path, dest: Path) -> bool:
+    """Copy ``src`` to ``dest`` unless ``dest`` already matches its size and mtime."""
+    src_stat = src.stat()
+    try:
+        dest_stat = dest.stat()
+    except FileNotFoundError:
+        pass
+    else:
+        if (
+            dest_stat.st_size == src_stat.st_size
+            and dest_stat.st_mtime_ns == src_stat.st_mtime_ns
+        ):
+            return False
+    shutil.copy2(src, dest)
+    return True
+
+
+def _bind_listen_socket(port: int = 0) -> socket.socket:
+    """Bind and listen on loopback so uvicorn can adopt the socket without a rebind."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    try:
         sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        return sock.getsockname()[1]
+        sock.bind(("127.0.0.1", port))
+        sock.listen(128)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+_LOG_LISTENER: Optional[logging.handlers.QueueListener] = None
+_LOG_HANDLER: Optional[logging.handlers.QueueHandler] = None
+_LOGGER_NAMES = ("SteelChatApp", "uvicorn", "uvicorn.error", "uvicorn.access")
 
 
 def _configure_logging() -> logging.Logger:
+    """Route app and uvicorn logs through a queue drained by a background file writer.
+
+    Loggers on the uvicorn event loop only enqueue records; the single
+    ``FileHandler`` lives on the ``QueueListener`` thread. Repeat calls reuse the
+    running listener instead of opening another handle on ``backend.log``.
+    """
+    global _LOG_LISTENER, _LOG_HANDLER
+
+    if _LOG_LISTENER is not None:
+        return logging.getLogger("SteelChatApp")
+
     LOG_DIR.mkdir(parents=True, exist_ok=True)
     log_path = LOG_DIR / "backend.log"
-    handler = logging.FileHandler(log_path, encoding="utf-8")
+    file_handler = logging.FileHandler(log_path, encoding="utf-8")
     formatter = logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
-    handler.setFormatter(formatter)
+    file_handler.setFormatter(formatter)
 
-    root = logging.getLogger("SteelChatApp")
-    root.setLevel(logging.INFO)
-    root.handlers = [handler]
-    root.propagate = False
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _LOG_HANDLER = logging.handlers.QueueHandler(log_queue)
+    _LOG_LISTENER = logging.handlers.QueueListener(log_queue, file_handler)
+    _LOG_LISTENER.start()
 
-    for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+    for name in _LOGGER_NAMES:
         logger = logging.getLogger(name)
         logger.setLevel(logging.INFO)
-        logger.handlers = [handler]
+        logger.handlers = [_LOG_HANDLER]
         logger.propagate = False
 
     logging.getLogger(__name__).info("Logging initialised at %s", log_path)
-    return root
+    return logging.getLogger("SteelChatApp")
+
+
+def _stop_logging() -> None:
+    """Flush queued records and close the log file, if a listener is running."""
+    global _LOG_LISTENER, _LOG_HANDLER
+
+    # Detach the queue first so late records (e.g. a backend thread that
+    # outlived ``join``) are not parked in a queue nothing drains any more.
+    handler, _LOG_HANDLER = _LOG_HANDLER, None
+    if handler is not None:
+        for name in _LOGGER_NAMES:
+            logger = logging.getLogger(name)
+            logger.removeHandler(handler)
+            logger.propagate = True
+
+    listener, _LOG_LISTENER = _LOG_LISTENER, None
+    if listener is not None:
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+
+
+def _prepare_import_environment(support_dir: Path) -> None:
+    """Apply the env defaults and ``sys.path`` entry that ``import server`` relies on."""
+    # Stringify once; setdefault only reaches putenv for keys not yet set, and
+    # both writes land before ``server``/``docstore`` read them at import.
+    support_str = str(support_dir)
+    os.environ.setdefault("DOCSTORE_DB", support_str + os.sep + "docstore.db")
+    os.environ.setdefault("STEELCHAT_APP_SUPPORT", support_str)
+
+    project_root = str(_PROJECT_ROOT)
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+
+
+def preload_server(app_support: Optional[Path] = None) -> Future:
+    """Start importing the bundled ``server`` module ahead of :meth:`EmbeddedBackend.start`.
+
+    ``docstore`` reads ``DOCSTORE_DB`` at import time, so the environment is
+    prepared first on the calling thread: ``setenv`` is not safe while Cocoa
+    may be calling ``getenv`` elsewhere. Only the import runs on a worker; the
+    later import in ``_prepare_environment`` then resolves from ``sys.modules``.
+    """
+    _prepare_import_environment(app_support or APP_SUPPORT_DEFAULT)
+    preloader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="server-preload")
+    future = preloader.submit(importlib.import_module, "server")
+    preloader.shutdown(wait=False)
+    return future
+
+
+class _ReadySignallingServer(uvicorn.Server):
+    """uvicorn server that sets ``ready`` once lifespan startup finishes and it is accepting."""
+
+    def __init__(self, config: uvicorn.Config, ready: threading.Event):
+        super().__init__(config)
+        self._ready = ready
+
+    async def startup(self, sockets: Optional[List[socket.socket]] = None) -> None:
+        await super().startup(sockets=sockets)
+        if self.started:
+            self._ready.set()
 
 
 class EmbeddedBackend:
     """Manage a uvicorn server bound to a bundled FastAPI app."""
 
     def __init__(self, port: Optional[int] = None, app_support: Optional[Path] = None):
-        self.port = port or _find_free_port()
+        self._listen_sock = _bind_listen_socket(port or 0)
+        self.port: int = self._listen_sock.getsockname()[1]
         self._thread: Optional[threading.Thread] = None
         self._server: Optional[uvicorn.Server] = None
         self._app = None
-        self._shutdown = threading.Event()
         self._logger = _configure_logging()
         self.app_support = app_support or APP_SUPPORT_DEFAULT
-        self._app_module_ready = threading.Event()
+        self._serving = threading.Event()
 
     def _prepare_environment(self) -> None:
         support_dir = _ensure_directory(self.app_support)
         tmp_dir = _ensure_directory(support_dir / "tmp")
 
-        os.environ.setdefault("DOCSTORE_DB", str(support_dir / "docstore.db"))
-        os.environ.setdefault("STEELCHAT_APP_SUPPORT", str(support_dir))
-
-        project_root = Path(__file__).resolve().parents[2]
-        if str(project_root) not in sys.path:
-            sys.path.insert(0, str(project_root))
-
-        resources_dir = Path(__file__).resolve().parent.parent / "resources"
-        web_dir = resources_dir / "web"
-        if web_dir.exists():
-            dest_index = support_dir / "index.html"
-            src_index = web_dir / "index.html"
-            if src_index.exists():
-                shutil.copy2(src_index, dest_index)
-
-        tmp_src = project_root / "tmp"
-        if tmp_src.exists():
-            for item in tmp_src.iterdir():
-                dest = tmp_dir / item.name
-                if not dest.exists():
-                    if item.is_file():
-                        shutil.copy2(item, dest)
-                    elif item.is_dir():
-                        shutil.copytree(item, dest)
-
-        docstore_src = project_root / "docstore.db"
+        _prepare_import_environment(support_dir)
+
+        src_index = _RESOURCES_DIR / "web" / "index.html"
+        if src_index.exists():
+            _copy_if_stale(src_index, support_dir / "index.html")
+
+        tmp_src = _PROJECT_ROOT / "tmp"
+        if tmp_src.is_dir():
+            # DirEntry caches the type from readdir, avoiding a stat per item.
+            with os.scandir(tmp_src) as entries:
+                for entry in entries:
+                    dest = tmp_dir / entry.name
+                    if dest.exists():
+                        continue
+                    if entry.is_file() or entry.is_dir():
+                        _clone_or_copy(Path(entry.path), dest)
+
+        docstore_src = _PROJECT_ROOT / "docstore.db"
         docstore_dest = support_dir / "docstore.db"
         if docstore_src.exists() and not docstore_dest.exists():
-            shutil.copy2(docstore_src, docstore_dest)
+            _clone_or_copy(docstore_src, docstore_dest)
 
         import server  # type: ignore
 
@@ -105,44 +269,61 @@ class EmbeddedBackend:
         server.TMP_DIR = str(tmp_dir)
         self._app = server.app
         self._logger.info("Server APP_DIR redirected to %s", server.APP_DIR)
-        self._app_module_ready.set()
 
     def start(self) -> None:
         if self._thread and self._thread.is_alive():
             return
 
         def _runner() -> None:
+            # Keep the scheduler from parking startup on efficiency cores.
+            _set_thread_qos(QOS_CLASS_USER_INITIATED)
             try:
                 self._prepare_environment()
                 config = uvicorn.Config(
                     self._app,
-                    host="127.0.0.1",
-                    port=self.port,
                     log_config=None,
-                    loop="asyncio",
+                    loop=UVICORN_LOOP,
+                    http=UVICORN_HTTP,
+                    # Match ChatClient's keepalive_expiry so its pre-warmed
+                    # socket is still open when the first real request lands.
+                    timeout_keep_alive=300,
+                )
+                self._server = _ReadySignallingServer(config, self._serving)
+                self._logger.info(
+                    "Starting backend on port %s (loop=%s, http=%s)",
+                    self.port,
+                    UVICORN_LOOP,
+                    UVICORN_HTTP,
                 )
-                self._server = uvicorn.Server(config)
-                self._logger.info("Starting backend on port %s", self.port)
-                self._server.run()
+                self._server.run(sockets=[self._listen_sock])
             except Exception:
                 self._logger.exception("Backend crashed")
             finally:
-                self._shutdown.set()
+                if not self._serving.is_set():
+                    # A start that never reached "serving" would otherwise leave the
+                    # pre-bound socket listening, and clients would hang instead of
+                    # being refused.
+                    self._listen_sock.close()
                 self._logger.info("Backend thread exiting")
 
         self._thread = threading.Thread(target=_runner, daemon=True)
         self._thread.start()
 
     def wait_ready(self, timeout: float = 30.0) -> bool:
-        return self._app_module_ready.wait(timeout)
+        """Block until uvicorn has finished startup and is accepting connections."""
+        # ``is_set`` reads the flag without entering the Event's condition variable.
+        if self._serving.is_set():
+            return True
+        return self._serving.wait(timeout)
 
     def stop(self) -> None:
         if self._server is not None:
             self._server.should_exit = True
         if self._thread is not None:
             self._thread.join(timeout=10.0)
-        self._shutdown.set()
+        self._listen_sock.close()
         self._logger.info("Backend stopped")
+        _stop_logging()
 
 
-__all__ = ["EmbeddedBackend"]
+__all__ = ["EmbeddedBackend", "preload_server"]
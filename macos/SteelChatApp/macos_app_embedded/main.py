@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import functools
 import time
 import importlib
 import pathlib
@@ -20,37 +21,39 @@ from Foundation import NSAutoreleasePool, NSMakeRect
 from PyObjCTools import AppHelper
 
 
+@functools.lru_cache(maxsize=None)
 def _load_components():
     """Load backend and UI components, working both as a package and as a script."""
-    package_dir = pathlib.Path(__file__).resolve().parent
-    package_name = package_dir.name
-    module_base = __package__ or package_name
-
-    try:
-        # Try importing with the detected package/module base
-        backend_module = importlib.import_module(f"{module_base}.backend")
-        ui_module = importlib.import_module(f"{module_base}.ui")
-        return backend_module.EmbeddedBackend, ui_module.build_web_chat_view
-    except ModuleNotFoundError:
-        # Fallback: ensure parent directory is on sys.path
-        parent_dir = package_dir.parent
-        parent_str = str(parent_dir)
+    if __package__:
+        module_base = __package__
+    else:
+        # Run as a script (e.g. the py2app entry point): make the package importable.
+        package_dir = pathlib.Path(__file__).resolve().parent
+        parent_str = str(package_dir.parent)
         if parent_str not in sys.path:
             sys.path.insert(0, parent_str)
+        module_base = package_dir.name
 
-        backend_module = importlib.import_module(f"{package_name}.backend")
-        ui_module = importlib.import_module(f"{package_name}.ui")
-        return backend_module.EmbeddedBackend, ui_module.build_web_chat_view
-
-
-EmbeddedBackend, build_web_chat_view = _load_components()
+    backend_module = importlib.import_module(f"{module_base}.backend")
+    ui_module = importlib.import_module(f"{module_base}.ui")
+    return (
+        backend_module.EmbeddedBackend,
+        backend_module.preload_server,
+        ui_module.build_web_chat_view,
+    )
 
 
 class AppDelegate(NSObject):
     def applicationDidFinishLaunching_(self, _notification):
+        EmbeddedBackend, _preload, build_web_chat_view = _load_components()
         self.backend = EmbeddedBackend()
         self.backend.start()
-        self.backend.wait_ready()
+        self._http = httpx.Client(
+            base_url=f"http://127.0.0.1:{self.backend.port}",
+            timeout=1.0,
+            limits=httpx.Limits(max_keepalive_connections=2, keepalive_expiry=30),
+            transport=httpx.HTTPTransport(retries=0),
+        )
         self._await_backend()
 
         mask = (
@@ -68,31 +71,44 @@ class AppDelegate(NSObject):
         self.window.makeKeyAndOrderFront_(None)
 
     def _await_backend(self, timeout: float = 30.0) -> None:
-        base = f"http://127.0.0.1:{self.backend.port}"
-        deadline = time.time() + timeout
-        with httpx.Client(timeout=1.0) as client:
-            while time.time() < deadline:
-                try:
-                    resp = client.get(f"{base}/api/health")
-                    if resp.status_code == 200:
-                        return
-                except Exception:
-                    pass
-                time.sleep(0.5)
+        deadline = time.monotonic() + timeout
+        # Block on the backend's readiness event rather than polling: it is set
+        # once uvicorn is accepting, so the first GET below normally succeeds.
+        # A raw connect_ex() probe would not help because the listening socket
+        # is pre-bound and the kernel accepts connections before uvicorn runs.
+        self.backend.wait_ready(timeout)
+        delay = 0.02
+        while time.monotonic() < deadline:
+            try:
+                resp = self._http.get("/api/health")
+                if resp.status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            time.sleep(delay)
+            delay = min(delay * 1.5, 0.25)
 
     def applicationShouldTerminate_(self, _app) -> bool:
+        if hasattr(self, "_http"):
+            self._http.close()
         if hasattr(self, "backend"):
             self.backend.stop()
         return True
 
 
 def main() -> None:
+    # Overlap the heavy FastAPI/server import with Cocoa bring-up; the backend
+    # thread's own ``import server`` then finds it in ``sys.modules``.
+    _backend_cls, preload_server, _build_view = _load_components()
+    preload_server()
+
     pool = NSAutoreleasePool.alloc().init()
     app = NSApplication.sharedApplication()
     delegate = AppDelegate.alloc().init()
     app.setDelegate_(delegate)
     NSApp.activateIgnoringOtherApps_(True)
-    AppHelper.runEventLoop()
+    # The bundled app has no terminal to send Ctrl-C; skip the SIGINT machinery.
+    AppHelper.runEventLoop(installInterrupt=False)
     pool.drain()
 
 
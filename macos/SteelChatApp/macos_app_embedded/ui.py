@@ -3,13 +3,25 @@
 from __future__ import annotations
 
 import asyncio
+import codecs
 import json
 import os
 import threading
+import time
 from typing import Any, Dict, List, Union
 
 import httpx
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional for the dev shell
+    orjson = None
+
+try:
+    import uvloop
+except ImportError:  # pragma: no cover - uvloop is unavailable on some dev hosts
+    uvloop = None
+
 from Cocoa import (
     NSAlert,
     NSAlertStyleInformational,
@@ -17,10 +29,14 @@ from Cocoa import (
     NSAppearanceNameVibrantDark,
     NSApp,
     NSApplication,
+    NSAttributedString,
     NSBackingStoreBuffered,
     NSBezelStyleRounded,
     NSButton,
     NSColor,
+    NSFont,
+    NSFontAttributeName,
+    NSForegroundColorAttributeName,
     NSMakeRect,
     NSLayoutConstraint,
     NSLayoutConstraintOrientationHorizontal,
@@ -35,6 +51,7 @@ from Cocoa import (
     NSSegmentedControlSegmentStyle,
     NSSegmentedCell,
     NSTextAlignmentRight,
+    NSTextContainer,
     NSTextField,
     NSTextView,
     NSView,
@@ -42,8 +59,22 @@ from Cocoa import (
     NSWindow,
     NSWindowStyleMask,
 )
-from Foundation import NSBundle, NSObject, NSURL
+from Foundation import (
+    NSBundle,
+    NSMakeRange,
+    NSMakeSize,
+    NSNotFound,
+    NSObject,
+    NSRunLoopCommonModes,
+    NSURL,
+)
 from PyObjCTools import AppHelper
+
+try:
+    from AppKit import NSTextContentStorage, NSTextLayoutManager
+except ImportError:  # pragma: no cover - TextKit 2 needs macOS 12+ and a recent PyObjC
+    NSTextContentStorage = NSTextLayoutManager = None
+
 from WebKit import (
     WKUserContentController,
     WKUserScript,
@@ -53,6 +84,19 @@ from WebKit import (
 )
 
 
+# Streamed deltas are coalesced and written to the transcript at most this often.
+_DELTA_FLUSH_INTERVAL = 1 / 60.0
+_TELEMETRY_FORMAT = "tkn: {}/{} • {}"
+# The transcript view keeps only this many trailing characters; ``history`` keeps everything.
+MAX_UI_CHARS = 200_000
+# Trimming inspects only this many UTF-16 units around the cut, never the whole transcript.
+_TRIM_WINDOW = 4096
+# Attachments are read and UTF-8 decoded in blocks of this size off the main thread.
+_ATTACH_READ_CHUNK = 256 * 1024
+# Ask the server to batch model deltas into ~30 Hz SSE events.
+_STREAM_BATCH_MS = 33
+
+
 def main_thread(func):
     """Decorator to ensure UI updates are on the main thread."""
 
@@ -62,35 +106,104 @@ def main_thread(func):
     return wrapper
 
 
+if orjson is not None:
+    _json_loads = orjson.loads
+
+    def _json_pretty(obj: Any) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+
+else:
+    _json_loads = json.loads
+
+    def _json_pretty(obj: Any) -> str:
+        return json.dumps(obj, indent=2)
+
+
+def _read_attachment(path: str) -> Dict[str, Any]:
+    """Read ``path`` as a text attachment, bailing out to ``binary`` on the first bad byte."""
+    name = os.path.basename(path)
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="strict")
+    parts: List[str] = []
+    try:
+        with open(path, "rb") as handle:
+            while block := handle.read(_ATTACH_READ_CHUNK):
+                parts.append(decoder.decode(block))
+        parts.append(decoder.decode(b"", final=True))
+    except UnicodeDecodeError:
+        return {"type": "binary", "name": name}
+    return {"type": "text", "name": name, "text": "".join(parts)}
+
+
+def _parse_sse_line(buf: bytearray, start: int, end: int) -> Dict[str, Any] | None:
+    """Decode the ``data:`` line at ``buf[start:end]``, ignoring anything else.
+
+    The prefix is checked in place, so non-data lines never allocate; only the
+    payload is sliced out and handed to the JSON decoder as bytes.
+    """
+    if not buf.startswith(b"data:", start, end):
+        return None
+    payload = buf[start + 5 : end].strip()
+    if not payload:
+        return None
+    try:
+        return _json_loads(payload)
+    except ValueError:
+        return None
+
+
 class ChatClient:
-    """Thin async client for server endpoints, with thread helpers."""
+    """Thin async client for server endpoints, with thread helpers.
+
+    Requests run on a private asyncio loop thread; every callback is delivered
+    on the AppKit main thread.
+    """
 
     def __init__(self, base: str):
         self.base = base.rstrip("/")
-        self._loop = asyncio.new_event_loop()
+        # A private uvloop loop; no global policy change via ``uvloop.install()``.
+        self._loop = uvloop.new_event_loop() if uvloop is not None else asyncio.new_event_loop()
         self._thr = threading.Thread(target=self._loop.run_forever, daemon=True)
         self._thr.start()
-        self._client = httpx.AsyncClient(http2=True, timeout=None)
+        # The transport owns http2/limits; client-level values would be ignored.
+        transport = httpx.AsyncHTTPTransport(
+            http2=True,
+            retries=0,
+            limits=httpx.Limits(keepalive_expiry=300),
+        )
+        self._client = httpx.AsyncClient(transport=transport, timeout=None)
+        self._run(self._prewarm())
+
+    async def _prewarm(self) -> None:
+        """Open a keep-alive connection so the first real request skips the handshake."""
+        try:
+            await self._client.get(f"{self.base}/api/health", timeout=2.0)
+        except httpx.HTTPError:
+            pass
 
     def _run(self, coro):
         return asyncio.run_coroutine_threadsafe(coro, self._loop)
 
     async def _post_stream(self, path: str, json_body: Dict[str, Any]):
         url = f"{self.base}{path}"
+        # Scan raw bytes for line breaks from where the previous chunk ended so
+        # long streams stay linear; only ``data:`` payloads are ever decoded.
+        pending = bytearray()
         async with self._client.stream("POST", url, json=json_body) as resp:
-            async for chunk in resp.aiter_lines():
-                if not chunk:
-                    continue
-                if not chunk.startswith("data:"):
-                    continue
-                payload = chunk[5:].strip()
-                if not payload:
-                    continue
-                try:
-                    evt = json.loads(payload)
-                    yield evt
-                except Exception:
-                    continue
+            async for raw in resp.aiter_bytes():
+                search_from = len(pending)
+                pending += raw
+                line_start = 0
+                while (nl := pending.find(b"\n", search_from)) != -1:
+                    evt = _parse_sse_line(pending, line_start, nl)
+                    line_start = search_from = nl + 1
+                    if evt is not None:
+                        yield evt
+                if line_start:
+                    del pending[:line_start]
+        if pending:
+            evt = _parse_sse_line(pending, 0, len(pending))
+            if evt is not None:
+                yield evt
 
     def chat_stream(
         self,
@@ -99,8 +212,16 @@ class ChatClient:
         system: str,
         on_event,
     ):
+        # Callbacks touch AppKit views, so deliver them on the main thread.
+        on_event = main_thread(on_event)
+
         async def _run_stream():
-            body = {"messages": messages, "settings": settings, "system": system}
+            body = {
+                "messages": messages,
+                "settings": settings,
+                "system": system,
+                "batch_ms": _STREAM_BATCH_MS,
+            }
             try:
                 async for evt in self._post_stream("/api/chat/stream", body):
                     on_event(evt)
@@ -110,32 +231,38 @@ class ChatClient:
         self._run(_run_stream())
 
     def models(self, on_result):
+        on_result = main_thread(on_result)
+
         async def _get():
             try:
                 r = await self._client.get(f"{self.base}/api/models", timeout=10.0)
-                on_result(r.json())
+                on_result(_json_loads(r.content))
             except Exception as e:
                 on_result({"error": str(e)})
 
         self._run(_get())
 
     def set_model(self, tag: str, on_result):
+        on_result = main_thread(on_result)
+
         async def _post():
             try:
                 r = await self._client.post(
                     f"{self.base}/api/models/set", json={"model": tag}
                 )
-                on_result(r.json())
+                on_result(_json_loads(r.content))
             except Exception as e:
                 on_result({"error": str(e)})
 
         self._run(_post())
 
     def health(self, on_result):
+        on_result = main_thread(on_result)
+
         async def _get():
             try:
                 r = await self._client.get(f"{self.base}/api/health", timeout=5.0)
-                on_result(r.json())
+                on_result(_json_loads(r.content))
             except Exception as e:
                 on_result({"ok": False, "error": str(e)})
 
@@ -150,7 +277,9 @@ class NativeChatView(NSView):
         if self is None:
             return None
         self.client = client
-        self.history: List[Dict[str, str]] = []
+        # Conversation kept as parallel role/content lists; see ``history``.
+        self._roles: List[str] = []
+        self._contents: List[str] = []
         self.streaming = False
         self.settings: Dict[str, Any] = {
             "dynamic_ctx": True,
@@ -165,9 +294,15 @@ class NativeChatView(NSView):
         self.system = ""
         self.attachments: List[Dict[str, Any]] = []
         self._assistant_buf = ""
+        self._pending_delta = ""
+        self._flush_scheduled = False
+        # Attachment batches still being read on the client loop; Send waits on them.
+        self._pending_attachments = 0
         self._started_at = 0.0
         self._first_byte = 0.0
         self._last_token_est = 0
+        self._in_token_est = 0
+        self._telemetry_text = ""
         self._build()
         return self
 
@@ -183,7 +318,7 @@ class NativeChatView(NSView):
         self.scroll = NSScrollView.alloc().init()
         self.scroll.setTranslatesAutoresizingMaskIntoConstraints_(False)
         self.scroll.setHasVerticalScroller_(True)
-        self.text = NSTextView.alloc().init()
+        self.text = self._make_transcript_view()
         self.text.setEditable_(False)
         self.text.setRichText_(True)
         self.text.setDrawsBackground_(False)
@@ -225,6 +360,13 @@ class NativeChatView(NSView):
         self.addSubview_(self.telemetry)
         self.addSubview_(self.spinner)
 
+        # Layer-back the hierarchy so scrolling over the vibrant background is
+        # composited on the GPU instead of re-blitting the effect view on the CPU.
+        self.setWantsLayer_(True)
+        self.scroll.setWantsLayer_(True)
+        self.prompt.setWantsLayer_(True)
+        self.prompt.layer().setOpaque_(True)
+
         for view in (
             self.bg,
             self.scroll,
@@ -236,8 +378,10 @@ class NativeChatView(NSView):
         ):
             view.setTranslatesAutoresizingMaskIntoConstraints_(False)
 
+        constraints = []
+
         def pin(a, attr_a, b, attr_b, constant=0.0):
-            self.addConstraint_(
+            constraints.append(
                 NSLayoutConstraint.constraintWithItem_attribute_relatedBy_toItem_attribute_multiplier_constant_(
                     a, attr_a, 0, b, attr_b, 1.0, constant
                 )
@@ -271,6 +415,9 @@ class NativeChatView(NSView):
         pin(self.spinner, 1, self.prompt, 1, 0.0)
         pin(self.spinner, 2, self, 2, -pad)
 
+        # One activation call means one layout-engine update instead of one per pin.
+        NSLayoutConstraint.activateConstraints_(constraints)
+
         self.text.setAutomaticQuoteSubstitutionEnabled_(False)
         self.text.setAutomaticDashSubstitutionEnabled_(False)
         self.text.setAutomaticTextReplacementEnabled_(False)
@@ -282,104 +429,210 @@ class NativeChatView(NSView):
 
         NSApp.setAppearance_(NSAppearance.appearanceNamed_(NSAppearanceNameVibrantDark))
 
+        # Shared attribute dicts: appends skip default-attribute resolution and
+        # adjacent runs coalesce into fewer, longer attribute runs.
+        font = self.text.font() or NSFont.systemFontOfSize_(0.0)
+        self._body_attrs = {
+            NSFontAttributeName: font,
+            NSForegroundColorAttributeName: NSColor.labelColor(),
+        }
+        self._system_attrs = {
+            NSFontAttributeName: font,
+            NSForegroundColorAttributeName: NSColor.secondaryLabelColor(),
+        }
+
+    def _make_transcript_view(self) -> NSTextView:
+        """Build the transcript on TextKit 2 so layout is bounded by the viewport.
+
+        Never touch ``layoutManager()`` on the result: doing so silently
+        downgrades the view to TextKit 1.
+        """
+        if NSTextLayoutManager is None:
+            return NSTextView.alloc().init()
+        # The layout manager only holds its content manager weakly; keep it alive.
+        self._transcript_content = NSTextContentStorage.alloc().init()
+        layout_manager = NSTextLayoutManager.alloc().init()
+        self._transcript_content.addTextLayoutManager_(layout_manager)
+        container = NSTextContainer.alloc().initWithSize_(NSMakeSize(0.0, 1.0e7))
+        container.setWidthTracksTextView_(True)
+        layout_manager.setTextContainer_(container)
+        view = NSTextView.alloc().initWithFrame_textContainer_(
+            NSMakeRect(0, 0, 0, 0), container
+        )
+        view.setVerticallyResizable_(True)
+        view.setHorizontallyResizable_(False)
+        view.setAutoresizingMask_(2)  # NSViewWidthSizable
+        view.setMaxSize_(NSMakeSize(1.0e7, 1.0e7))
+        return view
+
     def _append_system(self, text: str):
-        buf = self.text.string() or ""
-        buf += f"\n\n🛠 {text}\n"
-        self.text.setString_(buf)
-        self.text.scrollToEndOfDocument_(None)
+        self._flush_delta()
+        attr = NSAttributedString.alloc().initWithString_attributes_(
+            f"\n\n🛠 {text}\n", self._system_attrs
+        )
+        pinned = self._is_pinned_to_bottom()
+        self.text.textStorage().appendAttributedString_(attr)
+        self._trim_transcript()
+        if pinned:
+            self.text.scrollToEndOfDocument_(None)
 
     def _append_user(self, content: str):
-        from AppKit import NSAttributedString
-
-        attr = NSAttributedString.alloc().initWithString_(
-            f"\n\nYOU:\n{content}\n"
+        attr = NSAttributedString.alloc().initWithString_attributes_(
+            f"\n\nYOU:\n{content}\n", self._body_attrs
         )
         self.text.textStorage().appendAttributedString_(attr)
+        self._trim_transcript()
         self.text.scrollToEndOfDocument_(None)
 
     def _append_assistant_delta(self, delta: str):
         if not delta:
             return
-        from AppKit import NSAttributedString
+        self._pending_delta += delta
+        self._last_token_est += max(1, len(delta) >> 2)
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            # Common modes keep text streaming while a modal panel, an alert or
+            # a scroller drag runs the loop in a non-default mode.
+            self.performSelector_withObject_afterDelay_inModes_(
+                b"flushDelta:", None, _DELTA_FLUSH_INTERVAL, [NSRunLoopCommonModes]
+            )
+
+    def flushDelta_(self, _sender):
+        self._flush_delta()
 
-        attr = NSAttributedString.alloc().initWithString_(delta)
+    def _flush_delta(self):
+        """Write coalesced deltas with a single append, scroll and telemetry update."""
+        self._flush_scheduled = False
+        if not self._pending_delta:
+            return
+        attr = NSAttributedString.alloc().initWithString_attributes_(
+            self._pending_delta, self._body_attrs
+        )
+        self._pending_delta = ""
+        pinned = self._is_pinned_to_bottom()
         self.text.textStorage().appendAttributedString_(attr)
-        self.text.scrollToEndOfDocument_(None)
-        self._last_token_est = max(self._last_token_est, int(len(delta) / 4))
+        self._trim_transcript()
+        if pinned:
+            self.text.scrollToEndOfDocument_(None)
         self._update_telemetry()
 
-    def _append_assistant_done(self):
-        from AppKit import NSAttributedString
+    def _is_pinned_to_bottom(self, epsilon: float = 4.0) -> bool:
+        """True when the transcript is scrolled to (or within ``epsilon`` of) its end."""
+        visible = self.scroll.contentView().bounds()
+        doc_height = self.text.frame().size.height
+        return visible.origin.y + visible.size.height >= doc_height - epsilon
+
+    def _trim_transcript(self):
+        """Drop the oldest transcript text so TextKit work stays bounded."""
+        storage = self.text.textStorage()
+        length = storage.length()
+        excess = length - MAX_UI_CHARS
+        if excess <= 0:
+            return
+        # Lengths are UTF-16 units: never split a surrogate pair such as the
+        # tool glyph, and prefer cutting at a line start. PyObjC hands back
+        # ``str`` copies, so work on a small NSString window near the cut.
+        base = max(0, excess - 64)
+        window = storage.attributedSubstringFromRange_(
+            NSMakeRange(base, min(length - base, _TRIM_WINDOW))
+        ).string().nsstring()
+        start, span = window.rangeOfComposedCharacterSequenceAtIndex_(excess - 1 - base)
+        cut = start + span
+        newline, _ = window.rangeOfString_options_range_(
+            "\n", 0, NSMakeRange(cut, window.length() - cut)
+        )
+        if newline != NSNotFound:
+            cut = newline + 1
+        storage.deleteCharactersInRange_(NSMakeRange(0, base + cut))
 
-        end = NSAttributedString.alloc().initWithString_("\n\n")
+    def _append_assistant_done(self):
+        self._flush_delta()
+        end = NSAttributedString.alloc().initWithString_attributes_(
+            "\n\n", self._body_attrs
+        )
+        pinned = self._is_pinned_to_bottom()
         self.text.textStorage().appendAttributedString_(end)
-        self.text.scrollToEndOfDocument_(None)
+        if pinned:
+            self.text.scrollToEndOfDocument_(None)
 
     def _build_user_payload(self, prompt: str) -> str:
-        user = prompt
+        parts = [prompt]
         for att in self.attachments:
             if att.get("type") == "text" and att.get("text"):
-                user += (
+                parts.append(
                     f"\n\n**File: {att.get('name','file')}**\n```\n{att['text']}\n```\n"
                 )
             elif att.get("type") == "image" and att.get("url"):
-                user += f"\n\n![{att.get('name', 'image')}]({att['url']})\n"
+                parts.append(f"\n\n![{att.get('name', 'image')}]({att['url']})\n")
             else:
-                user += f"\n\n(Attached file: {att.get('name', 'file')})\n"
-        return user
+                parts.append(f"\n\n(Attached file: {att.get('name', 'file')})\n")
+        return "".join(parts)
 
     def send_(self, _):
         if self.streaming:
             # No cancel in this simple version
             return
+        if self._pending_attachments:
+            # sendBtn is disabled meanwhile; this also guards other callers.
+            return
         prompt = str(self.prompt.string()).strip()
         if not prompt and not self.attachments:
             return
         user_text = self._build_user_payload(prompt)
-        self.history.append({"role": "user", "content": user_text})
+        self.attachments = []
+        self._roles.append("user")
+        self._contents.append(user_text)
         self._append_user(user_text)
         self.prompt.setString_("")
         self.streaming = True
         self.spinner.startAnimation_(None)
-        import time
-
         self._started_at = time.perf_counter()
         self._first_byte = 0.0
         self._last_token_est = 0
-        self._update_telemetry(in_tokens=int(len(user_text) / 4))
+        self._in_token_est = len(user_text) >> 2
+        self._update_telemetry(in_tokens=self._in_token_est)
         self._assistant_buf = ""
         self._start_stream()
 
     def attach_(self, _):
         panel = NSOpenPanel.openPanel()
         panel.setAllowsMultipleSelection_(True)
-        if panel.runModal():
-            for url in panel.URLs():
-                path = url.path()
+        if not panel.runModal():
+            return
+        paths = [str(url.path()) for url in panel.URLs()]
+        if not paths:
+            return
+
+        async def _read_all():
+            for path in paths:
                 try:
-                    name = os.path.basename(path)
-                    with open(path, "rb") as handle:
-                        data = handle.read()
-                    # Heuristic: treat small files as text
-                    try:
-                        text = data.decode("utf-8")
-                        self.attachments.append(
-                            {"type": "text", "name": name, "text": text}
-                        )
-                    except Exception:
-                        self.attachments.append(
-                            {"type": "binary", "name": name}
-                        )
+                    att = await asyncio.to_thread(_read_attachment, path)
                 except Exception as exc:
-                    self._append_system(f"Failed to attach: {exc}")
+                    AppHelper.callAfter(self._append_system, f"Failed to attach: {exc}")
+                else:
+                    AppHelper.callAfter(self.attachments.append, att)
+            AppHelper.callAfter(self._finish_attach)
+
+        self._pending_attachments += 1
+        self.sendBtn.setEnabled_(False)
+        self.spinner.startAnimation_(None)
+        self.client._run(_read_all())
+
+    def _finish_attach(self):
+        self._pending_attachments -= 1
+        if not self._pending_attachments:
+            self.sendBtn.setEnabled_(True)
+        self._stop_spinner_if_idle()
+
+    def _stop_spinner_if_idle(self):
+        if not self.streaming and not self._pending_attachments:
+            self.spinner.stopAnimation_(None)
 
     def _on_event(self, evt: Dict[str, Any]):
         typ = evt.get("type")
         if typ == "delta":
             delta = evt.get("delta", "")
             if self._first_byte == 0.0:
-                import time
-
                 self._first_byte = time.perf_counter()
                 self._update_telemetry()
             self._append_assistant_delta(delta)
@@ -395,33 +648,47 @@ class NativeChatView(NSView):
         elif typ == "done":
             self._append_assistant_done()
             self.streaming = False
-            self.spinner.stopAnimation_(None)
+            self._stop_spinner_if_idle()
             if getattr(self, "_assistant_buf", ""):
-                self.history.append(
-                    {"role": "assistant", "content": self._assistant_buf}
-                )
+                self._roles.append("assistant")
+                self._contents.append(self._assistant_buf)
         elif typ == "error":
             self._append_system(f"Error: {evt.get('message')}")
             self.streaming = False
-            self.spinner.stopAnimation_(None)
+            self._stop_spinner_if_idle()
+
+    def _history_for_wire(self) -> List[Dict[str, str]]:
+        return [{"role": r, "content": c} for r, c in zip(self._roles, self._contents)]
+
+    @property
+    def history(self) -> List[Dict[str, str]]:
+        """Snapshot of the conversation as ``{"role", "content"}`` dicts."""
+        return self._history_for_wire()
+
+    @history.setter
+    def history(self, messages: List[Dict[str, str]]) -> None:
+        self._roles = [m["role"] for m in messages]
+        self._contents = [m["content"] for m in messages]
 
     def _start_stream(self):
-        settings = dict(self.settings)
-        system = self.system
-        self.client.chat_stream(self.history, settings, system, self._on_event)
+        # ``settings`` is only ever replaced wholesale (see SettingsPanel.applySettings_),
+        # never mutated in place, so the request can share the current dict.
+        self.client.chat_stream(
+            self._history_for_wire(), self.settings, self.system, self._on_event
+        )
 
     def _update_telemetry(self, in_tokens: int | None = None):
-        import time
-
         latency_ms = "—"
         if self._first_byte:
             latency_ms = f"{int(1000 * (self._first_byte - self._started_at))} ms"
         out = self._last_token_est or 0
         if in_tokens is None:
-            in_tokens = 0
-            if self.history:
-                in_tokens = int(len(self.history[-1].get("content", "")) / 4)
-        self.telemetry.setStringValue_(f"tkn: {in_tokens}/{out} • {latency_ms}")
+            in_tokens = self._in_token_est
+        text = _TELEMETRY_FORMAT.format(in_tokens, out, latency_ms)
+        # Skip the field invalidation/redraw when nothing visible changed.
+        if text != self._telemetry_text:
+            self._telemetry_text = text
+            self.telemetry.setStringValue_(text)
 
 
 class SettingsPanel(NSWindow):
@@ -584,7 +851,7 @@ class SettingsPanel(NSWindow):
 
     def refreshModels_(self, _sender) -> None:
         def on_result(obj: Dict[str, Any]) -> None:
-            self.modelsList.setString_(json.dumps(obj, indent=2))
+            self.modelsList.setString_(_json_pretty(obj))
 
         self.client.models(on_result)
 
@@ -595,7 +862,7 @@ class SettingsPanel(NSWindow):
 
         def on_result(obj: Dict[str, Any]) -> None:
             NSAlert.alertWithMessageText_defaultButton_alternateButton_otherButton_informativeTextWithFormat_(
-                "Model", "OK", None, None, json.dumps(obj)
+                "Model", "OK", None, None, _json_pretty(obj)
             ).runModal()
 
         self.client.set_model(tag, on_result)
@@ -614,21 +881,29 @@ class SettingsPanel(NSWindow):
         self.client.health(on_health)
 
 
+# Injected once per web view at document start. Config arrives as a JSON string
+# literal so the backend URL is never spliced into JS source unescaped.
+_FETCH_PATCH_TEMPLATE = """
+(function() {
+    const STEELCHAT = JSON.parse(__STEELCHAT_CONFIG__);
+    window.STEELCHAT_BACKEND = STEELCHAT.base;
+    const originalFetch = window.fetch.bind(window);
+    window.fetch = function(resource, init) {
+        if (typeof resource === 'string' && resource[0] === '/') {
+            return originalFetch(STEELCHAT.base + resource, init);
+        }
+        if (resource instanceof Request && resource.url[0] === '/') {
+            return originalFetch(new Request(STEELCHAT.base + resource.url, resource), init);
+        }
+        return originalFetch(resource, init);
+    };
+})();
+"""
+
+
 def _fetch_patch_script(base: str) -> str:
-    return f"""
-    (function() {{
-        const BASE = {json.dumps(base)};
-        const originalFetch = window.fetch.bind(window);
-        window.fetch = function(resource, init) {{
-            if (typeof resource === 'string' && resource.startsWith('/')) {{
-                resource = BASE + resource;
-            }} else if (resource instanceof Request && resource.url && resource.url.startsWith('/')) {{
-                resource = new Request(BASE + resource.url, resource);
-            }}
-            return originalFetch(resource, init);
-        }};
-    }})();
-    """
+    config = json.dumps(json.dumps({"base": base}))
+    return _FETCH_PATCH_TEMPLATE.replace("__STEELCHAT_CONFIG__", config)
 
 
 def build_web_chat_view(port_or_base: Union[int, str]) -> WKWebView:
@@ -646,12 +921,6 @@ def build_web_chat_view(port_or_base: Union[int, str]) -> WKWebView:
         True,
     )
     controller.addUserScript_(script)
-    port_script = WKUserScript.alloc().initWithSource_injectionTime_forMainFrameOnly_(
-        f"window.STEELCHAT_BACKEND = '{base_url}';",
-        WKUserScriptInjectionTimeAtDocumentStart,
-        True,
-    )
-    controller.addUserScript_(port_script)
     config.setUserContentController_(controller)
     web = WKWebView.alloc().initWithFrame_configuration_(NSMakeRect(0, 0, 900, 640), config)
 
@@ -8,6 +8,7 @@ from typing import Any, Dict, List, Optional
 from contextlib import asynccontextmanager
 import hashlib
 import mimetypes
+import time
 import pathlib
 
 import httpx
@@ -755,6 +756,12 @@ async def chat_stream(payload: Dict[str, Any]):
     settings = payload.get("settings", {})
     system_prompt = payload.get("system", "")
     developer_prompt = payload.get("developer") or DEFAULT_DEVELOPER_PROMPT
+    # Optional client hint: coalesce model deltas into batches of at most this
+    # many milliseconds (0 keeps one SSE event per model chunk).
+    try:
+        batch_s = clamp(float(payload.get("batch_ms") or 0), 0.0, 250.0) / 1000.0
+    except (TypeError, ValueError):
+        batch_s = 0.0
 
     combined_prompt_parts: List[str] = []
     if system_prompt:
@@ -1037,6 +1044,19 @@ async def chat_stream(payload: Dict[str, Any]):
                 req["tools"] = TOOLS
             tool_calls = []
             done_payload = None
+            pending_deltas: List[str] = []
+            # Start "long ago" so the first delta goes out immediately.
+            last_flush = -math.inf
+
+            def _drain_deltas() -> bytes:
+                nonlocal last_flush
+                last_flush = time.monotonic()
+                if not pending_deltas:
+                    return b""
+                out = DATA + orjson.dumps({"type": "delta", "delta": "".join(pending_deltas)}) + END
+                pending_deltas.clear()
+                return out
+
             try:
                 async with client.stream("POST", f"{OLLAMA_HOST}/api/chat", json=req, timeout=None) as resp:
                     status_code = resp.status_code
@@ -1066,87 +1086,133 @@ async def chat_stream(payload: Dict[str, Any]):
                     data: Dict[str, Any] = {}
                     saw_payload = False
                     last_event: Optional[str] = None
-                    async for chunk in resp.aiter_bytes():
-                        if not chunk:
-                            continue
-                        buffer += chunk
-                        while b"\n" in buffer:
-                            line, buffer = buffer.split(b"\n", 1)
-                            line = line.strip()
-                            if not line:
-                                continue
-                            if line.startswith(b":"):
-                                # Comment/heartbeat per SSE spec
-                                continue
-                            if line.lower().startswith(b"event:"):
-                                try:
-                                    last_event = line.split(b":", 1)[1].strip().decode()
-                                except Exception:
-                                    last_event = None
+                    chunks = resp.aiter_bytes().__aiter__()
+                    next_chunk: Optional[asyncio.Future] = None
+                    ended = False
+                    try:
+                        while True:
+                            if next_chunk is None:
+                                next_chunk = asyncio.ensure_future(chunks.__anext__())
+                            if pending_deltas:
+                                # Flush on the batch window even if upstream stalls; the
+                                # read stays pending rather than being cancelled.
+                                wait_s = batch_s - (time.monotonic() - last_flush)
+                                if wait_s > 0:
+                                    await asyncio.wait((next_chunk,), timeout=wait_s)
+                                if not next_chunk.done():
+                                    yield _drain_deltas()
+                                    continue
+                            try:
+                                chunk = await next_chunk
+                            except StopAsyncIteration:
+                                ended = True
+                                break
+                            finally:
+                                next_chunk = None
+                            if not chunk:
                                 continue
-                            if line.lower().startswith(b"data:"):
-                                line = line.split(b":", 1)[1].strip()
+                            buffer += chunk
+                            while b"\n" in buffer:
+                                line, buffer = buffer.split(b"\n", 1)
+                                line = line.strip()
                                 if not line:
                                     continue
-
-                            if line in (b"[DONE]", b"done", b"{\"done\":true}"):
-                                data = {"done": True}
-                            else:
-                                try:
-                                    data = orjson.loads(line)
-                                except Exception:
-                                    # Some servers send event: done + data: {}
-                                    if (last_event or "").lower() == "done":
-                                        data = {"done": True}
-                                    else:
+                                if line.startswith(b":"):
+                                    # Comment/heartbeat per SSE spec
+                                    continue
+                                if line.lower().startswith(b"event:"):
+                                    try:
+                                        last_event = line.split(b":", 1)[1].strip().decode()
+                                    except Exception:
+                                        last_event = None
+                                    continue
+                                if line.lower().startswith(b"data:"):
+                                    line = line.split(b":", 1)[1].strip()
+                                    if not line:
                                         continue
 
-                            saw_payload = True
-                            msg = data.get("message", {})
-                            if isinstance(msg, dict) and "content" in msg:
-                                yield DATA + orjson.dumps({"type": "delta", "delta": msg["content"]}) + END
-
-                            err_text = None
-                            if isinstance(data, dict):
-                                if "error" in data and data["error"]:
-                                    err_text = str(data["error"])
-                                elif status_code >= 400 and not data.get("done") and not msg:
-                                    # Non-OK response without explicit error field
-                                    err_text = f"HTTP {status_code}: {data}"
-                            if err_text:
-                                yield DATA + orjson.dumps({"type": "error", "message": err_text}) + END
-                                done_payload = {"type": "error"}
-                                break
+                                if line in (b"[DONE]", b"done", b"{\"done\":true}"):
+                                    data = {"done": True}
+                                else:
+                                    try:
+                                        data = orjson.loads(line)
+                                    except Exception:
+                                        # Some servers send event: done + data: {}
+                                        if (last_event or "").lower() == "done":
+                                            data = {"done": True}
+                                        else:
+                                            continue
 
-                            if isinstance(msg, dict) and "tool_calls" in msg:
-                                tool_calls = msg["tool_calls"]
-                                # Let the UI know about tool_calls payload
-                                yield DATA + orjson.dumps({"type": "tool_calls", "tool_calls": tool_calls}) + END
-                                # Stop reading more deltas; we'll execute the tools now
+                                saw_payload = True
+                                msg = data.get("message", {})
+                                if isinstance(msg, dict) and "content" in msg:
+                                    if batch_s and isinstance(msg["content"], str):
+                                        pending_deltas.append(msg["content"])
+                                    else:
+                                        yield DATA + orjson.dumps({"type": "delta", "delta": msg["content"]}) + END
+
+                                err_text = None
+                                if isinstance(data, dict):
+                                    if "error" in data and data["error"]:
+                                        err_text = str(data["error"])
+                                    elif status_code >= 400 and not data.get("done") and not msg:
+                                        # Non-OK response without explicit error field
+                                        err_text = f"HTTP {status_code}: {data}"
+                                if err_text:
+                                    if pending_deltas:
+                                        yield _drain_deltas()
+                                    yield DATA + orjson.dumps({"type": "error", "message": err_text}) + END
+                                    done_payload = {"type": "error"}
+                                    break
+
+                                if isinstance(msg, dict) and "tool_calls" in msg:
+                                    tool_calls = msg["tool_calls"]
+                                    # Let the UI know about tool_calls payload
+                                    if pending_deltas:
+                                        yield _drain_deltas()
+                                    yield DATA + orjson.dumps({"type": "tool_calls", "tool_calls": tool_calls}) + END
+                                    # Stop reading more deltas; we'll execute the tools now
+                                    break
+
+                            if pending_deltas and time.monotonic() - last_flush >= batch_s:
+                                yield _drain_deltas()
+
+                            # If the last parsed event indicated completion, finalize this round
+                            if isinstance(data, dict) and data.get("done"):
+                                metrics = data.get("metrics", {})
+                                usage = {
+                                    "prompt_eval_count": metrics.get("prompt_eval_count"),
+                                    "eval_count": metrics.get("eval_count"),
+                                    "total_duration_ms": int(metrics.get("total_duration", 0) / 1e6)
+                                    if metrics.get("total_duration") else None,
+                                    "eval_duration_ms": int(metrics.get("eval_duration", 0) / 1e6)
+                                    if metrics.get("eval_duration") else None,
+                                }
+                                done_payload = {"type": "done", "options": options, "usage": usage}
                                 break
-
-                        # If the last parsed event indicated completion, finalize this round
-                        if isinstance(data, dict) and data.get("done"):
-                            metrics = data.get("metrics", {})
-                            usage = {
-                                "prompt_eval_count": metrics.get("prompt_eval_count"),
-                                "eval_count": metrics.get("eval_count"),
-                                "total_duration_ms": int(metrics.get("total_duration", 0) / 1e6)
-                                if metrics.get("total_duration") else None,
-                                "eval_duration_ms": int(metrics.get("eval_duration", 0) / 1e6)
-                                if metrics.get("eval_duration") else None,
-                            }
-                            done_payload = {"type": "done", "options": options, "usage": usage}
-                            break
-                    else:
+                    finally:
+                        if next_chunk is not None:
+                            # Let the read unwind before the response is closed.
+                            next_chunk.cancel()
+                            try:
+                                await next_chunk
+                            except (asyncio.CancelledError, StopAsyncIteration):
+                                pass
+                    if ended:
                         # aiter_bytes exhausted without break -> stream ended naturally
                         if not saw_payload and status_code >= 400:
                             yield DATA + orjson.dumps({"type": "error", "message": f"HTTP {status_code} from model host"}) + END
                             done_payload = {"type": "error"}
+                    if pending_deltas:
+                        yield _drain_deltas()
             except httpx.RequestError as e:
+                if pending_deltas:
+                    yield _drain_deltas()
                 yield DATA + orjson.dumps({"type": "error", "message": f"Backend request failed: {e}"}) + END
                 break
             except Exception as e:
+                if pending_deltas:
+                    yield _drain_deltas()
                 yield DATA + orjson.dumps({"type": "error", "message": f"Unexpected error: {e.__class__.__name__}: {e}"}) + END
                 break
 
@@ -0,0 +1,148 @@
+import asyncio
+import types
+
+import httpx
+import orjson
+
+import server
+
+
+def _line(obj) -> bytes:
+    return orjson.dumps(obj) + b"\n"
+
+
+def _content(text: str) -> bytes:
+    return _line({"message": {"role": "assistant", "content": text}, "done": False})
+
+
+DONE = _line({"done": True})
+
+
+class _Clock:
+    """Stand-in for ``server.time`` so batching does not depend on wall time."""
+
+    def __init__(self):
+        self.ms = 0
+
+    def monotonic(self) -> float:
+        return self.ms / 1000.0
+
+
+def _run_stream(monkeypatch, payload, rounds, step_ms=5):
+    """Drive ``chat_stream`` against canned NDJSON rounds and return its events.
+
+    Each round answers one upstream ``/api/chat`` request. Every line arrives
+    as its own chunk, ``step_ms`` after the previous one; a float in a round
+    pauses upstream for that many seconds and an exception is raised mid-read.
+    """
+    clock = _Clock()
+    monkeypatch.setattr(server, "time", types.SimpleNamespace(monotonic=clock.monotonic))
+    remaining = list(rounds)
+
+    async def body(lines):
+        for line in lines:
+            if isinstance(line, Exception):
+                raise line
+            if isinstance(line, float):
+                # An upstream stall of ``line`` seconds.
+                await asyncio.sleep(line)
+                clock.ms += int(line * 1000)
+                continue
+            clock.ms += step_ms
+            yield line
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=body(remaining.pop(0)))
+
+    async def collect():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        monkeypatch.setattr(server.app.state, "client", client, raising=False)
+        try:
+            response = await server.chat_stream(payload)
+            raw = b"".join([chunk async for chunk in response.body_iterator])
+        finally:
+            await client.aclose()
+        events = []
+        for block in raw.split(b"\n\n"):
+            if block.startswith(b"data: "):
+                events.append(orjson.loads(block[len(b"data: "):]))
+        return events
+
+    events = asyncio.run(collect())
+    assert not remaining
+    return events
+
+
+def _payload(**extra):
+    payload = {"messages": [{"role": "user", "content": "hi"}], "tools": False}
+    payload.update(extra)
+    return payload
+
+
+def _deltas(events):
+    return [e["delta"] for e in events if e["type"] == "delta"]
+
+
+class TestChatStream:
+    def test_without_hint_sends_each_delta(self, monkeypatch):
+        words = [f"w{i} " for i in range(30)]
+        events = _run_stream(monkeypatch, _payload(), [[_content(w) for w in words] + [DONE]])
+        assert _deltas(events) == words
+        assert events[-1]["type"] == "done"
+
+    def test_batches_deltas_on_hint(self, monkeypatch):
+        words = [f"w{i} " for i in range(30)]
+        events = _run_stream(
+            monkeypatch, _payload(batch_ms=33), [[_content(w) for w in words] + [DONE]]
+        )
+        deltas = _deltas(events)
+        # The first delta goes out at once; then 5 ms per line against a 33 ms
+        # window gives four batches of seven, then the tail.
+        assert [len(d.split()) for d in deltas] == [1, 7, 7, 7, 7, 1]
+        assert "".join(deltas) == "".join(words)
+        assert events[-1]["type"] == "done"
+
+    def test_flushes_batch_when_upstream_stalls(self, monkeypatch):
+        lines = [_content("a"), _content("b"), _content("c"), 0.5, _content("d"), DONE]
+        events = _run_stream(monkeypatch, _payload(batch_ms=33), [lines])
+        # "bc" must go out on the window timer, not wait for "d" after the stall.
+        assert _deltas(events) == ["a", "bc", "d"]
+        assert events[-1]["type"] == "done"
+
+    def test_ignores_invalid_hint(self, monkeypatch):
+        words = ["a", "b", "c"]
+        events = _run_stream(
+            monkeypatch, _payload(batch_ms="abc"), [[_content(w) for w in words] + [DONE]]
+        )
+        assert _deltas(events) == words
+        assert events[-1]["type"] == "done"
+
+    def test_flushes_pending_deltas_before_error(self, monkeypatch):
+        lines = [_content("a"), _content("b"), _content("c"), _line({"error": "boom"})]
+        events = _run_stream(monkeypatch, _payload(batch_ms=250), [lines], step_ms=1)
+        types_ = [e["type"] for e in events]
+        assert types_[:3] == ["delta", "delta", "error"]
+        assert _deltas(events) == ["a", "bc"]
+        assert events[2]["message"] == "boom"
+
+    def test_flushes_pending_deltas_before_read_error(self, monkeypatch):
+        lines = [_content("a"), _content("b"), _content("c"), httpx.ReadError("reset")]
+        events = _run_stream(monkeypatch, _payload(batch_ms=250), [lines], step_ms=1)
+        types_ = [e["type"] for e in events]
+        assert types_[:3] == ["delta", "delta", "error"]
+        assert _deltas(events) == ["a", "bc"]
+        assert "reset" in events[2]["message"]
+
+    def test_flushes_pending_deltas_before_tool_calls(self, monkeypatch):
+        call = {"id": "call_1", "type": "function", "function": {"name": "no_such_tool", "arguments": {}}}
+        first = [
+            _content("a"),
+            _content("b"),
+            _content("c"),
+            _line({"message": {"role": "assistant", "content": "", "tool_calls": [call]}, "done": False}),
+        ]
+        second = [_content("d"), DONE]
+        events = _run_stream(monkeypatch, _payload(batch_ms=250), [first, second], step_ms=1)
+        types_ = [e["type"] for e in events]
+        assert types_ == ["delta", "delta", "tool_calls", "tool_result", "delta", "done"]
+        assert _deltas(events) == ["a", "bc", "d"]